@@ -1,2 +1,3 @@
-from ._gasal2 import GasalAligner, PAlign  # binary extension built by CMake
-__all__ = ["GasalAligner", "PAlign"]
+from ._gasal2 import BatchResult, GasalAligner, PAlign  # binary extension built by CMake
+from .sequtils import check_alphabet, pack_batch, pack_seq
+__all__ = ["BatchResult", "GasalAligner", "PAlign", "check_alphabet", "pack_batch", "pack_seq"]
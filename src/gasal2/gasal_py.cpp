@@ -19,17 +19,21 @@
 
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <pybind11/numpy.h>
 
 
 #include <cstdint>
+#include <numeric>
 #include <string>
 #include <string_view>
 #include <vector>
 #include <stdexcept>
 #include <algorithm>
 #include <cstdlib>
+#include <optional>
 #include <thread>
 #include <type_traits>
+#include <unordered_map>
 #include <utility>
 #include <memory>
 #include <iostream>
@@ -68,6 +72,10 @@ struct SubstScores {
 static inline void check_cuda_last_error() { CHECK_CUDA(cudaGetLastError()); }
 static inline int  round_up_8(int bytes)   { return (bytes + 7) & ~7; }
 
+// Bytes occupied by a sequence in GASAL's packed layout: 4 bits/base,
+// 8 bases per uint32 word, padded to a whole word.
+static inline uint32_t packed_nbytes(uint32_t n_bases) { return ((n_bases + 7u) / 8u) * 4u; }
+
 // helper to clamp negatives to 0 then cast to u32
 template <typename T>
 static inline uint32_t nonneg_to_u32(T v) {
@@ -78,6 +86,17 @@ static inline uint32_t nonneg_to_u32(T v) {
   }
 }
 
+// ---------- Result record for the structured-array batch API ----------
+// One row of the np.recarray returned by align_batch_arrays; ops_off indexes
+// into the flat ops/lens buffers returned alongside (n_ops runs per pair).
+struct AlignRecord {
+  int32_t  score;
+  int32_t  q_beg, q_end;
+  int32_t  s_beg, s_end;
+  uint64_t ops_off;
+  uint32_t n_ops;
+};
+
 // ---------- Result object exposed to Python ----------
 struct PAlign {
   int score;
@@ -87,13 +106,82 @@ struct PAlign {
   std::vector<uint32_t> lens;  // run-lengths, same size as ops
 };
 
+// ---------- SoA batch result ----------
+// One flat buffer per field instead of one PAlign object per pair; Python
+// sees each field as a zero-copy NumPy view (see the bindings), and
+// __getitem__ materializes a PAlign row on demand for spot checks.
+struct BatchResult {
+  std::vector<int32_t>  scores;
+  std::vector<int32_t>  q_begs, q_ends;
+  std::vector<int32_t>  s_begs, s_ends;
+  std::vector<uint64_t> ops_off;   // offset of each pair's runs in ops/lens
+  std::vector<uint32_t> n_ops;     // run count per pair
+  std::vector<uint8_t>  ops;       // all runs, concatenated
+  std::vector<uint32_t> lens;
+
+  static BatchResult from_aligns(std::vector<PAlign>&& res) {
+    BatchResult b;
+    const size_t n = res.size();
+    b.scores.resize(n); b.q_begs.resize(n); b.q_ends.resize(n);
+    b.s_begs.resize(n); b.s_ends.resize(n);
+    b.ops_off.resize(n); b.n_ops.resize(n);
+
+    uint64_t total = 0;
+    for (const auto& r : res) total += r.ops.size();
+    b.ops.reserve(total);
+    b.lens.reserve(total);
+
+    uint64_t off = 0;
+    for (size_t i = 0; i < n; ++i) {
+      const auto& r = res[i];
+      b.scores[i] = r.score;
+      b.q_begs[i] = r.q_beg; b.q_ends[i] = r.q_end;
+      b.s_begs[i] = r.s_beg; b.s_ends[i] = r.s_end;
+      b.ops_off[i] = off;
+      b.n_ops[i]   = (uint32_t)r.ops.size();
+      b.ops.insert(b.ops.end(),  r.ops.begin(),  r.ops.end());
+      b.lens.insert(b.lens.end(), r.lens.begin(), r.lens.end());
+      off += r.ops.size();
+    }
+    return b;
+  }
+
+  size_t size() const { return scores.size(); }
+
+  PAlign row(size_t i) const {
+    const size_t lo = (size_t)ops_off[i];
+    const size_t hi = lo + n_ops[i];
+    return PAlign{scores[i], q_begs[i], q_ends[i], s_begs[i], s_ends[i],
+                  std::vector<uint8_t>(ops.begin() + lo, ops.begin() + hi),
+                  std::vector<uint32_t>(lens.begin() + lo, lens.begin() + hi)};
+  }
+};
+
 // ------------------------------ Aligner class -------------------------------------
 class GasalAligner {
 public:
   GasalAligner(int match, int mismatch, int gap_open, int gap_extend,
-               int max_q = 2048, int max_t = 8192, int max_batch = 1024)
-  : max_q_(max_q), max_t_(max_t), init_cap_(std::max(1, max_batch)), cur_cap_(0)
+               int max_q = 2048, int max_t = 8192, int max_batch = 1024,
+               int num_streams = 2, bool use_graphs = false,
+               const std::string& score_dtype = "i32")
+  : max_q_(max_q), max_t_(max_t), init_cap_(std::max(1, max_batch)), cur_cap_(0),
+    num_streams_(std::min(std::max(1, num_streams), 8)),
+    use_graphs_(use_graphs)
   {
+    // int8 scores are only lossless when the best attainable score fits;
+    // semi-global tops out at min(max_q, max_t) * match.
+    if (score_dtype == "i8") {
+      const long best = (long)std::min(max_q_, max_t_) * (long)std::max(match, 0);
+      if (best > 127) {
+        throw std::invalid_argument(
+            "score_dtype='i8' requires min(max_q, max_t) * match <= 127");
+      }
+      score_i8_ = true;
+    } else if (score_dtype == "i32") {
+      score_i8_ = false;
+    } else {
+      throw std::invalid_argument("score_dtype must be 'i32' or 'i8'");
+    }
     int ndev = 0; CHECK_CUDA(cudaGetDeviceCount(&ndev));
     if (ndev == 0) throw std::runtime_error("No CUDA device detected.");
 
@@ -117,14 +205,36 @@ public:
     args_->semiglobal_skipping_head = QUERY;
     args_->semiglobal_skipping_tail = QUERY;
 
-    // Two streams for ping-pong pipeline
-    stor_v_ = gasal_init_gpu_storage_v(2);
+    // Same configuration minus traceback, for the min_score pre-filter and
+    // other score-only passes: no traceback kernel, no CIGAR D2H.
+    args_score_ = std::make_unique<Parameters>(0, nullptr);
+    args_score_->algo = SEMI_GLOBAL;
+    args_score_->start_pos = WITHOUT_START;
+    args_score_->semiglobal_skipping_head = QUERY;
+    args_score_->semiglobal_skipping_tail = QUERY;
+
+    // Same configuration, but for host-packed input: GASAL skips its
+    // device-side ASCII->4bit pack kernel when isPacked is set.
+    args_packed_ = std::make_unique<Parameters>(0, nullptr);
+    args_packed_->algo = SEMI_GLOBAL;
+    args_packed_->start_pos = WITH_TB;
+    args_packed_->semiglobal_skipping_head = QUERY;
+    args_packed_->semiglobal_skipping_tail = QUERY;
+    args_packed_->isPacked = true;
+
+    // num_streams GASAL streams, round-robined so H2D copy, kernel and D2H
+    // of one mini-batch overlap the host fill of the next (staged
+    // copy/execute); 2 gives the classic ping-pong, 3-4 hides more latency
+    // for small pairs.
+    stor_v_ = gasal_init_gpu_storage_v(num_streams_);
     check_cuda_last_error();
 
+    graphs_.resize((size_t)num_streams_);
     ensure_capacity(init_cap_);
   }
 
   ~GasalAligner() {
+    destroy_graphs();
     if (cur_cap_ > 0) {
       cudaError_t err = cudaDeviceSynchronize();
       if (err != cudaSuccess) {
@@ -159,30 +269,258 @@ public:
     const auto& R = *stor.host_res;
     const uint32_t nops0 = (R.n_cigar_ops ? nonneg_to_u32(R.n_cigar_ops[0]) : 0u);
     const uint32_t total_ops = nops0;
-    return fetch_one(stor, 0, /*prefix_off=*/0u, total_ops);
+    return fetch_one(stor, 0, /*prefix_off=*/0u, total_ops, /*with_tb=*/true);
   }
 
   // Zero-copy batch interface
   std::vector<PAlign> align_batch(const std::vector<std::string_view>& queries,
                                   const std::vector<std::string_view>& refs)
   {
-    const int n = (int)queries.size();
-    if (n != (int)refs.size()) throw std::invalid_argument("queries/refs length mismatch");
+    const int n = validate_pairs(queries, refs);
     if (n == 0) return {};
 
-    // Pre-validate BEFORE any GPU work
+    const auto order = sorted_order(n, [&](int i) {
+      return std::max(queries[i].size(), refs[i].size());
+    });
+    auto sorted = run_pipeline(n, args_.get(),
+        [&](gasal_gpu_storage_t& stor, int slot, int idx) {
+          return fill_sequence(stor, slot, queries[order[idx]], refs[order[idx]]);
+        });
+    return scatter_results(std::move(sorted), order);
+  }
+
+  // Two-pass variant: a score-only pass first (no traceback kernel, no CIGAR
+  // D2H), then traceback only for pairs scoring >= min_score. Filtered-out
+  // pairs keep their kernel score and report an empty CIGAR.
+  //
+  // The threshold is applied to the RAW KERNEL score — the only score that
+  // exists before traceback. Survivors' returned scores come from the WITH_TB
+  // rerun, which recomputes them from the CIGAR when the wrapper is built
+  // with GASALWRAP_RECOMPUTE_SCORE (the default), so a survivor's reported
+  // score may differ from the thresholded value and can even land below
+  // min_score.
+  std::vector<PAlign> align_batch_filtered(const std::vector<std::string_view>& queries,
+                                           const std::vector<std::string_view>& refs,
+                                           int min_score)
+  {
+    const int n = validate_pairs(queries, refs);
+    if (n == 0) return {};
+
+    const auto order = sorted_order(n, [&](int i) {
+      return std::max(queries[i].size(), refs[i].size());
+    });
+    auto scored = run_pipeline(n, args_score_.get(),
+        [&](gasal_gpu_storage_t& stor, int slot, int idx) {
+          return fill_sequence(stor, slot, queries[order[idx]], refs[order[idx]]);
+        });
+    std::vector<PAlign> out = scatter_results(std::move(scored), order);
+
+    // Survivors in length order already: filter the sorted index list
+    std::vector<int> keep;
+    keep.reserve(n);
+    for (int i : order) {
+      if (out[i].score >= min_score) keep.push_back(i);
+    }
+    if (!keep.empty()) {
+      std::vector<PAlign> full = run_pipeline((int)keep.size(), args_.get(),
+          [&](gasal_gpu_storage_t& stor, int slot, int idx) {
+            return fill_sequence(stor, slot, queries[keep[idx]], refs[keep[idx]]);
+          });
+      for (size_t k = 0; k < keep.size(); ++k) out[keep[k]] = std::move(full[k]);
+    }
+    return out;
+  }
+
+  // Scores-only fast path: runs the WITHOUT_START parameter set, so neither
+  // the traceback kernel nor the CIGAR D2H copy is paid. Returns kernel
+  // scores in caller order.
+  std::vector<int32_t> align_batch_scores_core(const std::vector<std::string_view>& queries,
+                                               const std::vector<std::string_view>& refs)
+  {
+    const int n = validate_pairs(queries, refs);
+    if (n == 0) return {};
+
+    const auto order = sorted_order(n, [&](int i) {
+      return std::max(queries[i].size(), refs[i].size());
+    });
+    auto scored = run_pipeline(n, args_score_.get(),
+        [&](gasal_gpu_storage_t& stor, int slot, int idx) {
+          return fill_sequence(stor, slot, queries[order[idx]], refs[order[idx]]);
+        });
+    std::vector<int32_t> out((size_t)n);
+    for (int k = 0; k < n; ++k) out[order[k]] = scored[k].score;
+    return out;
+  }
+
+  // Batch interface for host-packed input (4 bits/base, 8 bases per uint32
+  // word; see packed_nbytes). Sequences are laid out back to back in the flat
+  // q_packed/t_packed buffers, each occupying packed_nbytes(len) bytes.
+  std::vector<PAlign> align_batch_packed_core(const uint8_t* q_packed, size_t q_bytes,
+                                              const std::vector<uint32_t>& q_lens,
+                                              const uint8_t* t_packed, size_t t_bytes,
+                                              const std::vector<uint32_t>& t_lens)
+  {
+    const int n = (int)q_lens.size();
+    if (n != (int)t_lens.size()) throw std::invalid_argument("q_len/t_len length mismatch");
+    if (n == 0) return {};
+
+    // Pre-validate and compute per-sequence byte offsets BEFORE any GPU work
+    std::vector<uint32_t> q_offs(n), t_offs(n);
+    uint64_t qo = 0, to = 0;
+    for (int i = 0; i < n; ++i) {
+      if ((int)q_lens[i] > max_q_ || (int)t_lens[i] > max_t_) {
+        throw std::runtime_error("Sequence length exceeds max_q/max_t at pair " + std::to_string(i));
+      }
+      q_offs[i] = (uint32_t)qo;
+      t_offs[i] = (uint32_t)to;
+      qo += packed_nbytes(q_lens[i]);
+      to += packed_nbytes(t_lens[i]);
+    }
+    if (qo > q_bytes || to > t_bytes)
+      throw std::invalid_argument("Packed buffer is smaller than implied by the length vector");
+
+    const auto order = sorted_order(n, [&](int i) {
+      return std::max(q_lens[i], t_lens[i]);
+    });
+    auto sorted = run_pipeline(n, args_packed_.get(),
+        [&](gasal_gpu_storage_t& stor, int slot, int idx) {
+          const int i = order[idx];
+          return fill_sequence_packed(stor, slot,
+                                      q_packed + q_offs[i], q_lens[i],
+                                      t_packed + t_offs[i], t_lens[i]);
+        });
+    return scatter_results(std::move(sorted), order);
+  }
+
+  // True when the constructor asked for int8 score output (score_dtype="i8")
+  bool scores_as_i8() const { return score_i8_; }
+
+  // Device and host pools are sized once (gasal_init_streams in the ctor) and
+  // reused by every call — cudaMalloc never appears on the per-batch path.
+  // resize() grows them lazily when a caller wants bigger mini-batches than
+  // the constructor's max_batch; shrinking is a no-op.
+  void resize(int max_batch) {
+    const int want = std::max(1, max_batch);
+    if (want <= cur_cap_) return;
+    CHECK_CUDA(cudaDeviceSynchronize());
+    destroy_graphs();  // captured graphs bake in the old pool pointers
+    gasal_destroy_streams(&stor_v_, args_.get());
+    gasal_destroy_gpu_storage_v(&stor_v_);
+    stor_v_ = gasal_init_gpu_storage_v(num_streams_);
+    check_cuda_last_error();
+    init_cap_ = want;
+    cur_cap_ = 0;
+    ensure_capacity(init_cap_);
+  }
+
+private:
+  // Argsort pairs by the longer side. GASAL pads every mini-batch to its max
+  // query/target length, so batching similar-length pairs together cuts the
+  // padded DP cells; results are scattered back to caller order afterwards.
+  template <class LenFn>
+  static std::vector<int> sorted_order(int n, LenFn&& len_of) {
+    std::vector<int> order(n);
+    std::iota(order.begin(), order.end(), 0);
+    std::stable_sort(order.begin(), order.end(),
+                     [&](int a, int b) { return len_of(a) < len_of(b); });
+    return order;
+  }
+
+  static std::vector<PAlign> scatter_results(std::vector<PAlign>&& sorted,
+                                             const std::vector<int>& order) {
+    std::vector<PAlign> out(sorted.size());
+    for (size_t k = 0; k < order.size(); ++k) out[order[k]] = std::move(sorted[k]);
+    return out;
+  }
+
+  // Exact shape of one captured launch. qb/tb are cumulative padded batch
+  // byte counts, bounded by max_q/max_t * max_batch — megabytes at the
+  // defaults — so they need full-width fields; packing them into a single
+  // uint64_t would overflow and let distinct shapes replay each other's
+  // graphs with the wrong memcpy sizes baked in.
+  struct GraphKey {
+    const Parameters* params;  // mode: tb / score-only / packed
+    int chunk, qb, tb;
+    bool operator==(const GraphKey& o) const {
+      return params == o.params && chunk == o.chunk && qb == o.qb && tb == o.tb;
+    }
+  };
+  struct GraphKeyHash {
+    size_t operator()(const GraphKey& k) const {
+      size_t h = std::hash<const void*>{}(k.params);
+      for (uint64_t v : {(uint64_t)k.chunk, (uint64_t)k.qb, (uint64_t)k.tb}) {
+        h ^= std::hash<uint64_t>{}(v) + 0x9e3779b97f4a7c15ull + (h << 6) + (h >> 2);
+      }
+      return h;
+    }
+  };
+
+  // Replay the whole H2D + kernel + D2H sequence of a previously seen
+  // (mode, chunk, qb, tb) shape as a single cudaGraphLaunch; the first
+  // sighting captures it. Pointers are baked into the graph, which is safe
+  // because the pools are persistent — only buffer *contents* change between
+  // same-shape mini-batches. Keyed per stream since each stream owns its own
+  // storage. Pays off when many mini-batches share a shape (see the
+  // length-sorted chunking), saving ~10 us of launch overhead per batch.
+  void launch_or_replay(gasal_gpu_storage_t& stor, int s, int chunk,
+                        int qb, int tb, Parameters* params) {
+    const GraphKey key{params, chunk, qb, tb};
+    auto& cache = graphs_[s];
+    auto it = cache.find(key);
+    if (it == cache.end()) {
+      cudaGraph_t graph = nullptr;
+      CHECK_CUDA(cudaStreamBeginCapture(stor.str, cudaStreamCaptureModeThreadLocal));
+      gasal_aln_async(&stor, qb, tb, chunk, params);
+      CHECK_CUDA(cudaStreamEndCapture(stor.str, &graph));
+      cudaGraphExec_t exec = nullptr;
+      CHECK_CUDA(cudaGraphInstantiate(&exec, graph, nullptr, nullptr, 0));
+      CHECK_CUDA(cudaGraphDestroy(graph));
+      it = cache.emplace(key, exec).first;
+    }
+    CHECK_CUDA(cudaGraphLaunch(it->second, stor.str));
+    check_cuda_last_error();
+  }
+
+  void destroy_graphs() noexcept {
+    for (auto& cache : graphs_) {
+      for (auto& kv : cache) (void)cudaGraphExecDestroy(kv.second);
+      cache.clear();
+    }
+  }
+
+  // Pre-validate BEFORE any GPU work; returns the pair count
+  int validate_pairs(const std::vector<std::string_view>& queries,
+                     const std::vector<std::string_view>& refs) const
+  {
+    const int n = (int)queries.size();
+    if (n != (int)refs.size()) throw std::invalid_argument("queries/refs length mismatch");
     for (int i = 0; i < n; ++i) {
       if ((int)queries[i].size() > max_q_ || (int)refs[i].size() > max_t_) {
         throw std::runtime_error("Sequence length exceeds max_q/max_t at pair " + std::to_string(i));
       }
     }
+    return n;
+  }
 
+  // Shared pipeline: chunk [0, n) into mini-batches of init_cap_, round-robin
+  // the GASAL streams, fill via `fill(stor, slot, global_idx)`. A stream is
+  // drained just before it is reused, so up to num_streams_ mini-batches are
+  // in flight and their H2D/kernel/D2H stages overlap.
+  template <class FillFn>
+  std::vector<PAlign> run_pipeline(int n, Parameters* params, FillFn&& fill) {
     std::vector<PAlign> out(n);
 
-    // Ping-pong state
-    bool pending[2] = {false, false};
-    int  pending_chunk[2] = {0, 0};
-    int  pending_base[2]  = {0, 0};
+    // WITHOUT_START launches never refresh the host-side CIGAR buffers
+    // (GASAL only copies them back for WITH_TB runs), so score-only passes
+    // must not read host_res->cigar/n_cigar_ops: those still hold whatever
+    // the previous traceback batch left behind — or uninitialized memory on
+    // a fresh aligner.
+    const bool with_tb = (params->start_pos == WITH_TB);
+
+    const int K = num_streams_;
+    std::vector<char> pending((size_t)K, 0);
+    std::vector<int>  pending_chunk((size_t)K, 0);
+    std::vector<int>  pending_base((size_t)K, 0);
 
     int base = 0;
     int stream = 0;
@@ -200,10 +538,7 @@ public:
       int max_t_end = 0;
 
       for (int i = 0; i < chunk; ++i) {
-        const auto& q = queries[b + i];
-        const auto& r = refs[b + i];
-
-        auto [q_end_bytes, t_end_bytes] = fill_sequence(stor, i, q, r);
+        auto [q_end_bytes, t_end_bytes] = fill(stor, i, b + i);
         if (q_end_bytes > max_q_end) max_q_end = q_end_bytes;
         if (t_end_bytes > max_t_end) max_t_end = t_end_bytes;
 
@@ -215,10 +550,14 @@ public:
       const int qb = round_up_8(max_q_end);
       const int tb = round_up_8(max_t_end);
 
-      gasal_aln_async(&stor, qb, tb, chunk, args_.get());
-      check_cuda_last_error();
+      if (use_graphs_) {
+        launch_or_replay(stor, s, chunk, qb, tb, params);
+      } else {
+        gasal_aln_async(&stor, qb, tb, chunk, params);
+        check_cuda_last_error();
+      }
 
-      pending[s] = true;
+      pending[s] = 1;
       pending_chunk[s] = chunk;
       pending_base[s]  = b;
       return chunk;
@@ -236,7 +575,7 @@ public:
       std::vector<uint32_t> prefix_sums(chunk, 0u);
       uint32_t total_ops = 0u;
 
-      if (R.n_cigar_ops && R.cigar) {
+      if (with_tb && R.n_cigar_ops && R.cigar) {
         for (int i = 0; i < chunk; ++i) {
           prefix_sums[i] = total_ops;
           total_ops += nonneg_to_u32(R.n_cigar_ops[i]);
@@ -247,42 +586,36 @@ public:
       #pragma omp parallel for schedule(dynamic, 16) if (chunk >= 64)
 #endif
       for (int i = 0; i < chunk; ++i) {
-        out[base_idx + i] = fetch_one(stor, i, prefix_sums[i], total_ops);
+        out[base_idx + i] = fetch_one(stor, i, prefix_sums[i], total_ops, with_tb);
       }
 
-      pending[s] = false;
+      pending[s] = 0;
       pending_chunk[s] = 0;
       pending_base[s]  = 0;
     };
 
-    if (base < n) {
-      int launched = launch_chunk(0, base);
-      base += launched;
-      stream = 1;
-    }
     while (base < n) {
       const int s = stream;
-      const int other = s ^ 1;
-
-      int launched = launch_chunk(s, base);
-      base += launched;
-      fetch_results(other);
-      stream ^= 1;
+      fetch_results(s);  // drain the oldest in-flight batch before reuse
+      base += launch_chunk(s, base);
+      stream = (s + 1) % K;
     }
-    fetch_results(0);
-    fetch_results(1);
+    for (int s = 0; s < K; ++s) fetch_results(s);
 
     return out;
   }
 
-private:
   void ensure_capacity(int /*need*/) {
     if (cur_cap_ > 0) return; // already allocated up to init_cap_
+    // gasal_init_streams allocates every buffer on the H2D/D2H path
+    // page-locked already (GASAL's host batch, lens/offsets and result
+    // arrays), so the wrapper needs no pinned staging of its own. opbuf_ is
+    // only memcpy'd host-to-host by gasal_op_fill into that pinned batch.
     gasal_init_streams(&stor_v_, max_q_, max_t_, init_cap_, args_.get());
     check_cuda_last_error();
     cur_cap_ = init_cap_;
-    opbuf_[0].assign((size_t)init_cap_, 0u);
-    opbuf_[1].assign((size_t)init_cap_, 0u);
+    opbuf_.assign((size_t)num_streams_,
+                  std::vector<uint8_t>((size_t)init_cap_, (uint8_t)0));
   }
 
   // Fill one pair; returns end offsets in ASCII bytes for query and target
@@ -300,6 +633,25 @@ private:
     return { (int)qoff + (int)q.size(), (int)toff + (int)s.size() };
   }
 
+  // Packed variant: bytes are copied verbatim into the host batch; offsets are
+  // recorded in bases (2 bases per packed byte) as the kernels expect.
+  static inline std::pair<int,int> fill_sequence_packed(gasal_gpu_storage_t& stor, int i,
+                                  const uint8_t* q, uint32_t q_len,
+                                  const uint8_t* t, uint32_t t_len)
+  {
+    const uint32_t qn = packed_nbytes(q_len);
+    const uint32_t tn = packed_nbytes(t_len);
+    const uint32_t qoff = gasal_host_batch_fill(&stor, (uint32_t)i, reinterpret_cast<const char*>(q), qn, QUERY);
+    const uint32_t toff = gasal_host_batch_fill(&stor, (uint32_t)i, reinterpret_cast<const char*>(t), tn, TARGET);
+
+    stor.host_query_batch_offsets[i]  = qoff * 2u;
+    stor.host_target_batch_offsets[i] = toff * 2u;
+    stor.host_query_batch_lens[i]     = q_len;
+    stor.host_target_batch_lens[i]    = t_len;
+
+    return { (int)(qoff + qn), (int)(toff + tn) };
+  }
+
   inline void finalize_batch(gasal_gpu_storage_t& stor, uint32_t nseqs, int stream_idx) {
     if (nseqs == 0) {
       gasal_op_fill(&stor, nullptr, 0, QUERY);
@@ -331,14 +683,25 @@ private:
     return std::max(0, arr[i]);
   }
 
-  // CIGAR extraction and coordinate handling
+  // CIGAR extraction and coordinate handling. with_tb=false means the batch
+  // ran WITHOUT_START: the host CIGAR buffers were not refreshed, so only the
+  // kernel score and end coordinates are valid — return those with an empty
+  // traceback and do not recompute the score.
   inline PAlign fetch_one(gasal_gpu_storage_t& stor, int i,
-                          uint32_t prefix_off, uint32_t total_ops)
+                          uint32_t prefix_off, uint32_t total_ops,
+                          bool with_tb)
   {
     const auto& R = *stor.host_res;
 
     const int score_in = (R.aln_score ? R.aln_score[i] : 0);
-    const uint32_t nops_i = (R.n_cigar_ops ? nonneg_to_u32(R.n_cigar_ops[i]) : 0u);
+
+    // WITHOUT_START launches compute only scores and end positions; the host
+    // start arrays are as stale as the CIGAR buffers, so report begs as 0 and
+    // leave the valid ends unclamped.
+    if (!with_tb) {
+      return PAlign{score_in, 0, get_coord(R.query_batch_end, i),
+                    0, get_coord(R.target_batch_end, i), {}, {}};
+    }
 
     // Start/end reported by GASAL are relative to the ORIGINAL inputs (required behavior)
     int q_beg = get_coord(R.query_batch_start, i);
@@ -349,6 +712,8 @@ private:
     if (q_end < q_beg) q_end = q_beg;
     if (s_end < s_beg) s_end = s_beg;
 
+    const uint32_t nops_i = (R.n_cigar_ops ? nonneg_to_u32(R.n_cigar_ops[i]) : 0u);
+
     // If no CIGAR or invalid slice: return empty traceback and reported coords
     if (nops_i == 0 || !R.cigar || !valid_slice(stor, prefix_off, nops_i, total_ops)) {
       return PAlign{score_in, q_beg, q_end, s_beg, s_end, {}, {}};
@@ -419,27 +784,225 @@ private:
   int cur_cap_;
   SubstScores subst_{};
   gasal_gpu_storage_v stor_v_{};
-  std::vector<uint8_t> opbuf_[2];
+  int num_streams_;
+  bool use_graphs_;
+  bool score_i8_ = false;
+  std::vector<std::unordered_map<GraphKey, cudaGraphExec_t, GraphKeyHash>> graphs_;
+  std::vector<std::vector<uint8_t>> opbuf_;
   std::unique_ptr<Parameters> args_;
+  std::unique_ptr<Parameters> args_score_;
+  std::unique_ptr<Parameters> args_packed_;
 };
 
+// ----------------------------------------------------------------------------------
+// Zero-copy read-only NumPy view over wrapper-owned result memory. `base`
+// keeps the owning object alive for the lifetime of the view; read-only
+// because several views may share one result buffer.
+// ----------------------------------------------------------------------------------
+template <typename T>
+static py::array_t<T> make_view(const T* data, size_t n, py::handle base) {
+  auto a = py::array_t<T>({(py::ssize_t)n}, {(py::ssize_t)sizeof(T)}, data, base);
+  py::detail::array_proxy(a.ptr())->flags &= ~py::detail::npy_api::NPY_ARRAY_WRITEABLE_;
+  return a;
+}
+
 // ------------------------------- Pybind11 module ----------------------------------
 PYBIND11_MODULE(_gasal2, m) {
+  PYBIND11_NUMPY_DTYPE(AlignRecord, score, q_beg, q_end, s_beg, s_end, ops_off, n_ops);
+
   py::class_<PAlign>(m, "PAlign")
       .def_readonly("score", &PAlign::score)
       .def_readonly("q_beg", &PAlign::q_beg)
       .def_readonly("q_end", &PAlign::q_end)
       .def_readonly("s_beg", &PAlign::s_beg)
       .def_readonly("s_end", &PAlign::s_end)
-      .def_readonly("ops",   &PAlign::ops)
-      .def_readonly("lens",  &PAlign::lens);
-
-  py::class_<GasalAligner>(m, "GasalAligner")
-      .def(py::init<int,int,int,int,int,int,int>(),
+      // ops/lens as zero-copy NumPy views over the result buffers (the
+      // PAlign instance is kept alive as the array base) instead of
+      // per-access Python list materializations.
+      .def_property_readonly("ops", [](py::object self) {
+            auto& p = self.cast<PAlign&>();
+            return make_view(p.ops.data(), p.ops.size(), self);
+          })
+      .def_property_readonly("lens", [](py::object self) {
+            auto& p = self.cast<PAlign&>();
+            return make_view(p.lens.data(), p.lens.size(), self);
+          });
+
+#define GASALWRAP_SOA_VIEW(field) \
+  .def_property_readonly(#field, [](py::object self) { \
+    auto& b = self.cast<BatchResult&>(); \
+    return make_view(b.field.data(), b.field.size(), self); \
+  })
+
+  py::class_<BatchResult>(m, "BatchResult",
+      "Structure-of-arrays batch result. Each field is a zero-copy read-only\n"
+      "NumPy view over one shared buffer; ops/lens hold every pair's CIGAR\n"
+      "runs back to back, indexed by ops_off/n_ops. Indexing with [] builds a\n"
+      "PAlign for that row on demand.")
+      GASALWRAP_SOA_VIEW(scores)
+      GASALWRAP_SOA_VIEW(q_begs)
+      GASALWRAP_SOA_VIEW(q_ends)
+      GASALWRAP_SOA_VIEW(s_begs)
+      GASALWRAP_SOA_VIEW(s_ends)
+      GASALWRAP_SOA_VIEW(ops_off)
+      GASALWRAP_SOA_VIEW(n_ops)
+      GASALWRAP_SOA_VIEW(ops)
+      GASALWRAP_SOA_VIEW(lens)
+      .def("__len__", [](const BatchResult& b) { return b.size(); })
+      .def("__getitem__", [](const BatchResult& b, py::ssize_t i) {
+            if (i < 0) i += (py::ssize_t)b.size();
+            if (i < 0 || i >= (py::ssize_t)b.size()) throw py::index_error();
+            return b.row((size_t)i);
+          });
+
+#undef GASALWRAP_SOA_VIEW
+
+  py::class_<GasalAligner>(m, "GasalAligner",
+      "GPU pairwise aligner. Every align*/resize entry point releases the\n"
+      "GIL for the duration of the GPU work, so Python threads can drive\n"
+      "several instances concurrently; one instance must not be shared\n"
+      "between threads without external locking.")
+      .def(py::init<int,int,int,int,int,int,int,int,bool,const std::string&>(),
            py::arg("match"), py::arg("mismatch"),
            py::arg("gap_open"), py::arg("gap_extend"),
-           py::arg("max_q")=2048, py::arg("max_t")=8192, py::arg("max_batch")=1024)
+           py::arg("max_q")=2048, py::arg("max_t")=8192, py::arg("max_batch")=1024,
+           py::arg("num_streams")=2,
+           py::arg("use_graphs")=false, py::arg("score_dtype")="i32")
       .def("align",       &GasalAligner::align,       py::call_guard<py::gil_scoped_release>())
-      .def("align_batch", &GasalAligner::align_batch, py::call_guard<py::gil_scoped_release>());
+      .def("resize",      &GasalAligner::resize,      py::call_guard<py::gil_scoped_release>(),
+           py::arg("max_batch"),
+           "Grow the persistent per-stream pools to hold max_batch pairs per\n"
+           "mini-batch. No-op when the current capacity already suffices.")
+      .def("align_batch",
+           [](GasalAligner& self,
+              const std::vector<std::string_view>& queries,
+              const std::vector<std::string_view>& refs,
+              std::optional<int> min_score) {
+             py::gil_scoped_release nogil;
+             return min_score ? self.align_batch_filtered(queries, refs, *min_score)
+                              : self.align_batch(queries, refs);
+           },
+           py::arg("queries"), py::arg("refs"), py::arg("min_score") = py::none(),
+           "Batch alignment. When min_score is given, a score-only pass runs\n"
+           "first and traceback is computed only for pairs whose RAW KERNEL\n"
+           "score is >= min_score; filtered-out pairs keep that kernel score\n"
+           "and return empty ops/lens. Survivors' scores come from the\n"
+           "traceback pass (recomputed from the CIGAR in the default build)\n"
+           "and may differ from the thresholded kernel value.")
+      .def("align_batch_scores",
+           [](GasalAligner& self,
+              const std::vector<std::string_view>& queries,
+              const std::vector<std::string_view>& refs) {
+             std::vector<int32_t> scores;
+             {
+               py::gil_scoped_release nogil;
+               scores = self.align_batch_scores_core(queries, refs);
+             }
+             if (self.scores_as_i8()) {
+               // Saturating narrow: top end is bounded by the ctor check,
+               // heavily penalized pairs clamp to -128
+               auto* owned = new std::vector<int8_t>(scores.size());
+               for (size_t i = 0; i < scores.size(); ++i) {
+                 (*owned)[i] = (int8_t)std::max<int32_t>(-128, std::min<int32_t>(127, scores[i]));
+               }
+               py::capsule base(owned, [](void* p) {
+                 delete static_cast<std::vector<int8_t>*>(p);
+               });
+               return py::array(py::array_t<int8_t>({(py::ssize_t)owned->size()},
+                                                    {(py::ssize_t)sizeof(int8_t)},
+                                                    owned->data(), base));
+             }
+             auto* owned = new std::vector<int32_t>(std::move(scores));
+             py::capsule base(owned, [](void* p) {
+               delete static_cast<std::vector<int32_t>*>(p);
+             });
+             return py::array(py::array_t<int32_t>({(py::ssize_t)owned->size()},
+                                                   {(py::ssize_t)sizeof(int32_t)},
+                                                   owned->data(), base));
+           },
+           py::arg("queries"), py::arg("refs"),
+           "Score every pair without computing a traceback: skips the CIGAR\n"
+           "kernel and its D2H copy entirely. Returns np.int32[N] in caller\n"
+           "order (np.int8[N], saturating, when the aligner was built with\n"
+           "score_dtype='i8'); a zero-copy view over the result buffer.")
+      .def("align_batch_arrays",
+           [](GasalAligner& self,
+              const std::vector<std::string_view>& queries,
+              const std::vector<std::string_view>& refs) {
+             std::vector<PAlign> res;
+             {
+               py::gil_scoped_release nogil;
+               res = self.align_batch(queries, refs);
+             }
+             const py::ssize_t n = (py::ssize_t)res.size();
+             uint64_t total_runs = 0;
+             for (const auto& r : res) total_runs += r.ops.size();
+
+             py::array_t<AlignRecord> recs(n);
+             py::array_t<uint8_t>     ops((py::ssize_t)total_runs);
+             py::array_t<uint32_t>    lens((py::ssize_t)total_runs);
+             auto* rp = recs.mutable_data();
+             auto* op = ops.mutable_data();
+             auto* lp = lens.mutable_data();
+
+             uint64_t off = 0;
+             for (py::ssize_t i = 0; i < n; ++i) {
+               const auto& r = res[i];
+               rp[i] = AlignRecord{r.score, r.q_beg, r.q_end, r.s_beg, r.s_end,
+                                   off, (uint32_t)r.ops.size()};
+               std::copy(r.ops.begin(),  r.ops.end(),  op + off);
+               std::copy(r.lens.begin(), r.lens.end(), lp + off);
+               off += r.ops.size();
+             }
+             return py::make_tuple(recs, ops, lens);
+           },
+           py::arg("queries"), py::arg("refs"),
+           "Batch alignment returning (records, ops, lens): a structured array\n"
+           "with fields (score, q_beg, q_end, s_beg, s_end, ops_off, n_ops) and\n"
+           "flat CIGAR run buffers indexed by ops_off/n_ops. One pybind crossing\n"
+           "for the whole batch instead of one PAlign object per pair.")
+      .def("align_batch_soa",
+           [](GasalAligner& self,
+              const std::vector<std::string_view>& queries,
+              const std::vector<std::string_view>& refs,
+              std::optional<int> min_score) {
+             py::gil_scoped_release nogil;
+             auto res = min_score ? self.align_batch_filtered(queries, refs, *min_score)
+                                  : self.align_batch(queries, refs);
+             return BatchResult::from_aligns(std::move(res));
+           },
+           py::arg("queries"), py::arg("refs"), py::arg("min_score") = py::none(),
+           "Batch alignment returning a BatchResult: structure-of-arrays\n"
+           "fields (scores, q_begs, ..., ops, lens) exposed as zero-copy NumPy\n"
+           "views, instead of one PAlign object per pair. Supports the same\n"
+           "min_score pre-filter as align_batch, with the same semantics: the\n"
+           "threshold applies to the raw kernel score, while survivors report\n"
+           "the traceback pass's (recomputed) score.")
+      .def("align_batch_packed",
+           [](GasalAligner& self,
+              py::array_t<uint8_t,  py::array::c_style | py::array::forcecast> q_packed,
+              py::array_t<uint32_t, py::array::c_style | py::array::forcecast> q_len,
+              py::array_t<uint8_t,  py::array::c_style | py::array::forcecast> t_packed,
+              py::array_t<uint32_t, py::array::c_style | py::array::forcecast> t_len) {
+             const auto qb = q_packed.request();
+             const auto tb = t_packed.request();
+             const auto ql = q_len.request();
+             const auto tl = t_len.request();
+             if (qb.ndim != 1 || tb.ndim != 1 || ql.ndim != 1 || tl.ndim != 1)
+               throw std::invalid_argument("align_batch_packed expects 1-D arrays");
+             const auto* qlp = static_cast<const uint32_t*>(ql.ptr);
+             const auto* tlp = static_cast<const uint32_t*>(tl.ptr);
+             std::vector<uint32_t> q_lens(qlp, qlp + ql.shape[0]);
+             std::vector<uint32_t> t_lens(tlp, tlp + tl.shape[0]);
+
+             py::gil_scoped_release nogil;
+             return self.align_batch_packed_core(
+                 static_cast<const uint8_t*>(qb.ptr), (size_t)qb.shape[0], q_lens,
+                 static_cast<const uint8_t*>(tb.ptr), (size_t)tb.shape[0], t_lens);
+           },
+           py::arg("q_packed"), py::arg("q_len"), py::arg("t_packed"), py::arg("t_len"),
+           "Align pairs whose sequences are already packed on the host (4 bits/base,\n"
+           "8 bases per uint32 word — see gasal2.sequtils.pack_batch). Skips the\n"
+           "device-side ASCII pack step and transfers half the bytes per base.");
 }
 
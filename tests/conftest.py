@@ -0,0 +1,24 @@
+# tests/conftest.py
+import shutil
+
+import pytest
+
+
+def has_gpu() -> bool:
+    return shutil.which("nvidia-smi") is not None
+
+
+@pytest.fixture(scope="session")
+def aligner():
+    """One GasalAligner shared by the whole session.
+
+    CUDA context creation and the max_q/max_t/max_batch device pools are paid
+    once instead of per test. Scoring: match=2, mismatch=-3, gap_open=5,
+    gap_extend=2; max_batch is kept small so the internal mini-batch path
+    stays exercised.
+    """
+    if not has_gpu():
+        pytest.skip("No NVIDIA GPU available")
+    from gasal2 import GasalAligner
+    return GasalAligner(match=2, mismatch=-3, gap_open=5, gap_extend=2,
+                        max_q=4096, max_t=16384, max_batch=3)
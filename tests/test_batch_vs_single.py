@@ -1,49 +1,101 @@
 # tests/test_batch_vs_single.py
-import random
 import time
 from typing import List, Tuple
 
+import numpy as np
 import pytest
 from gasal2 import GasalAligner, PAlign
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional (pip install gasal2-py[numba])
+    njit = None
+
 # ---- markers ----
 pytestmark = [pytest.mark.gpu, pytest.mark.slow]
 
 # ---- helpers ----
 _ALPH = "ACGT"
+_ALPH_ARR = np.frombuffer(b"ACGT", dtype=np.uint8)
+_CODE_LUT = np.zeros(256, dtype=np.uint8)
+_CODE_LUT[list(b"ACGT")] = np.arange(4, dtype=np.uint8)
 _OP2C = {0: "M", 1: "X", 2: "D", 3: "I"}
+_OP_CHARS = np.frombuffer(b"MXDI", dtype=np.uint8)
+
+if njit is not None:
+    @njit(cache=True)
+    def _cigar_to_sam_bytes(ops, lens, out):  # pragma: no cover - jitted
+        pos = 0
+        for k in range(ops.shape[0]):
+            ln = int(lens[k])
+            if ln == 0:
+                out[pos] = 48  # '0'
+                pos += 1
+            else:
+                start = pos
+                while ln > 0:
+                    out[pos] = 48 + ln % 10
+                    ln //= 10
+                    pos += 1
+                end = pos - 1
+                while start < end:  # digits came out reversed
+                    out[start], out[end] = out[end], out[start]
+                    start += 1
+                    end -= 1
+            op = ops[k]
+            out[pos] = _OP_CHARS[op] if op < 4 else 77  # 'M'
+            pos += 1
+        return pos
 
 def rand_seq(L: int, seed: int | None = None) -> str:
-    rnd = random.Random(seed) if seed is not None else random
-    return "".join(rnd.choice(_ALPH) for _ in range(L))
+    rng = np.random.default_rng(seed)
+    return _ALPH_ARR[rng.integers(0, 4, L, dtype=np.uint8)].tobytes().decode("ascii")
 
 def mutate(s: str, p_sub: float = 0.05, p_ins: float = 0.02, p_del: float = 0.02, seed: int | None = None) -> str:
-    rnd = random.Random(seed) if seed is not None else random
-    out = []
-    i = 0
-    while i < len(s):
-        r = rnd.random()
-        if r < p_sub:
-            out.append(rnd.choice([b for b in _ALPH if b != s[i]]))
-            i += 1
-        elif r < p_sub + p_ins:
-            out.append(rnd.choice(_ALPH))  # insert
-        elif r < p_sub + p_ins + p_del:
-            i += 1  # delete base in target
-        else:
-            out.append(s[i])
-            i += 1
-    return "".join(out)
-
-def cigar_runs_to_sam(ops: List[int], lens: List[int]) -> str:
-    if not ops or not lens or len(ops) != len(lens):
+    # Vectorized: one uniform draw per source base selects substitution,
+    # insertion-before, deletion, or pass-through. No per-base Python loop.
+    rng = np.random.default_rng(seed)
+    src = np.frombuffer(s.encode("ascii"), dtype=np.uint8)
+    L = src.size
+    if L == 0:
+        return ""
+    r = rng.random(L)
+    sub = r < p_sub
+    ins = (r >= p_sub) & (r < p_sub + p_ins)
+    dele = (r >= p_sub + p_ins) & (r < p_sub + p_ins + p_del)
+
+    out = src.copy()
+    # Substitute with one of the three *other* bases
+    off = rng.integers(1, 4, L, dtype=np.uint8)
+    out[sub] = _ALPH_ARR[(_CODE_LUT[src[sub]] + off[sub]) % 4]
+
+    # Per position emit [inserted-base][kept-base], masked by (ins, ~del)
+    pair = np.empty((L, 2), dtype=np.uint8)
+    pair[:, 0] = _ALPH_ARR[rng.integers(0, 4, L, dtype=np.uint8)]
+    pair[:, 1] = out
+    emit = np.empty((L, 2), dtype=bool)
+    emit[:, 0] = ins
+    emit[:, 1] = ~dele
+    return pair[emit].tobytes().decode("ascii")
+
+def cigar_runs_to_sam(ops, lens) -> str:
+    if len(ops) == 0 or len(ops) != len(lens):
         return ""
-    return "".join(f"{ln}{_OP2C.get(op, 'M')}" for op, ln in zip(ops, lens))
+    if njit is None:
+        return "".join(f"{ln}{_OP2C.get(int(op), 'M')}" for op, ln in zip(ops, lens))
+    # Jitted bulk formatter: digits written straight into a byte buffer, one
+    # decode at the end instead of per-run f-string/str allocations
+    ops = np.ascontiguousarray(ops, dtype=np.uint8)
+    lens = np.ascontiguousarray(lens, dtype=np.uint32)
+    out = np.empty(ops.size * 11, dtype=np.uint8)  # <=10 digits + 1 op char per run
+    n = _cigar_to_sam_bytes(ops, lens, out)
+    return out[:n].tobytes().decode("ascii")
 
 def same_result(a: PAlign, b: PAlign) -> Tuple[bool, str]:
     if (a.score, a.q_beg, a.q_end, a.s_beg, a.s_end) != (b.score, b.q_beg, b.q_end, b.s_beg, b.s_end):
         return False, "score/coords differ"
-    if list(a.ops) != list(b.ops) or list(a.lens) != list(b.lens):
+    # ops/lens are NumPy views; array_equal is a memcmp, not an element loop
+    if not (np.array_equal(a.ops, b.ops) and np.array_equal(a.lens, b.lens)):
         return False, f"CIGAR differ: {cigar_runs_to_sam(a.ops, a.lens)} vs {cigar_runs_to_sam(b.ops, b.lens)}"
     return True, ""
 
@@ -73,16 +125,12 @@ def build_pairs() -> List[Tuple[str, str]]:
         pairs.append((q, s))
     return pairs
 
-@pytest.fixture(scope="module")
-def aligner() -> GasalAligner:
-    # Scoring: match=2, mismatch=-3, gap_open=5, gap_extend=2
-    # Force small max_batch to exercise internal mini-batches.
-    try:
-        return GasalAligner(match=2, mismatch=-3, gap_open=5, gap_extend=2,
-                            max_q=4096, max_t=16384, max_batch=3)
-    except TypeError:
-        # Older constructor signature fallback
-        return GasalAligner()
+# The shared session-scoped `aligner` fixture lives in conftest.py.
+
+def _result_matrix(results) -> np.ndarray:
+    """Stack (score, q_beg, q_end, s_beg, s_end) of each result into (N, 5) int32."""
+    return np.array([(r.score, r.q_beg, r.q_end, r.s_beg, r.s_end) for r in results],
+                    dtype=np.int32).reshape(-1, 5)
 
 def _compare_pairs(aligner: GasalAligner, pairs: list[tuple[str,str]]):
     queries  = [q for q, _ in pairs]
@@ -100,16 +148,24 @@ def _compare_pairs(aligner: GasalAligner, pairs: list[tuple[str,str]]):
 
     assert len(singles) == len(batched), "length mismatch singles vs batched"
 
+    # Vectorized score/coord comparison: one (N, 5) int32 equality instead of
+    # N Python tuple compares. Python is only re-entered for the bad rows.
+    singles_arr = _result_matrix(singles)
+    batched_arr = _result_matrix(batched)
+    bad_coords = np.flatnonzero((singles_arr != batched_arr).any(axis=1))
+    bad_cigars = [i for i, (ra, rb) in enumerate(zip(singles, batched))
+                  if not (np.array_equal(ra.ops, rb.ops) and np.array_equal(ra.lens, rb.lens))]
+
     mismatches = []
-    for i, (ra, rb) in enumerate(zip(singles, batched)):
-        ok, why = same_result(ra, rb)
-        if not ok:
-            qa, sa = pairs[i]
-            mismatches.append(
-                f"pair #{i}: {why} (|q|={len(qa)}, |s|={len(sa)})\n"
-                f"  single CIGAR: {cigar_runs_to_sam(ra.ops, ra.lens)}\n"
-                f"  batched CIGAR: {cigar_runs_to_sam(rb.ops, rb.lens)}"
-            )
+    for i in sorted(set(bad_coords.tolist()) | set(bad_cigars)):
+        ra, rb = singles[i], batched[i]
+        _, why = same_result(ra, rb)
+        qa, sa = pairs[i]
+        mismatches.append(
+            f"pair #{i}: {why} (|q|={len(qa)}, |s|={len(sa)})\n"
+            f"  single CIGAR: {cigar_runs_to_sam(ra.ops, ra.lens)}\n"
+            f"  batched CIGAR: {cigar_runs_to_sam(rb.ops, rb.lens)}"
+        )
 
     if mismatches:
         pytest.fail("MISMATCHES detected:\n" + "\n".join(mismatches))
@@ -128,3 +184,210 @@ def _compare_pairs(aligner: GasalAligner, pairs: list[tuple[str,str]]):
 def test_batch_matches_single(aligner: GasalAligner):
     pairs = build_pairs()
     _compare_pairs(aligner, pairs)
+
+def test_concurrent_instances_from_threads(aligner: GasalAligner):
+    # The bindings drop the GIL around the GPU work, so two Python threads
+    # driving two aligner instances must make progress and agree with the
+    # serial results.
+    from concurrent.futures import ThreadPoolExecutor
+
+    pairs = build_pairs()
+    queries = [q for q, _ in pairs]
+    targets = [s for _, s in pairs]
+    expected = aligner.align_batch(queries, targets)
+
+    def run(_):
+        a = GasalAligner(match=2, mismatch=-3, gap_open=5, gap_extend=2,
+                         max_q=4096, max_t=16384, max_batch=3)
+        return a.align_batch(queries, targets)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        for got in pool.map(run, range(2)):
+            for i, (ra, rb) in enumerate(zip(expected, got)):
+                ok, why = same_result(ra, rb)
+                assert ok, f"pair #{i}: {why}"
+
+def test_result_views_read_only(aligner: GasalAligner):
+    q = rand_seq(100, seed=42)
+    s = mutate(q, seed=43)
+    r = aligner.align(q, s)
+    assert r.ops.dtype == np.uint8
+    assert r.lens.dtype == np.uint32
+    # Views share the result buffer, so writes must be refused
+    with pytest.raises(ValueError):
+        r.ops[0] = 0
+    with pytest.raises(ValueError):
+        r.lens[0] = 0
+
+def test_scores_only_matches_kernel_scores(aligner: GasalAligner):
+    pairs = build_pairs()
+    queries = [q for q, _ in pairs]
+    targets = [s for _, s in pairs]
+
+    scores = aligner.align_batch_scores(queries, targets)
+    assert scores.dtype == np.int32 and scores.shape == (len(pairs),)
+
+    # A traceback run is NOT a valid reference here: the default build
+    # (GASALWRAP_RECOMPUTE_SCORE=1) replaces the kernel score with one
+    # recomputed from the CIGAR, which diverges from the kernel value for any
+    # pair with a mismatch or gap. The only same-scale cross-check is the
+    # min_score-strict path: a threshold above any attainable score leaves
+    # every PAlign holding the raw kernel score from its own score-only pass.
+    strict = aligner.align_batch(queries, targets, min_score=10 ** 9)
+    assert np.array_equal(scores, np.array([r.score for r in strict], dtype=np.int32))
+
+def test_score_dtype_i8(aligner: GasalAligner):
+    # Short-read config whose best score (min(max_q,max_t)*match) fits int8
+    short = GasalAligner(match=2, mismatch=-3, gap_open=5, gap_extend=2,
+                         max_q=48, max_t=63, max_batch=8, score_dtype="i8")
+    queries = [rand_seq(40, seed=100 + k) for k in range(6)]
+    targets = [mutate(q, seed=200 + k) for k, q in enumerate(queries)]
+
+    i8 = short.align_batch_scores(queries, targets)
+    assert i8.dtype == np.int8
+
+    wide = GasalAligner(match=2, mismatch=-3, gap_open=5, gap_extend=2,
+                        max_q=48, max_t=63, max_batch=8)
+    i32 = wide.align_batch_scores(queries, targets)
+    assert np.array_equal(i8.astype(np.int32), np.clip(i32, -128, 127))
+
+    # Configurations whose scores could overflow int8 must be rejected up front
+    with pytest.raises(ValueError):
+        GasalAligner(match=2, mismatch=-3, gap_open=5, gap_extend=2,
+                     max_q=4096, max_t=16384, score_dtype="i8")
+    with pytest.raises(ValueError):
+        GasalAligner(match=2, mismatch=-3, gap_open=5, gap_extend=2,
+                     max_q=48, max_t=63, score_dtype="i16")
+
+def test_resize_grows_capacity(aligner: GasalAligner):
+    pairs = build_pairs()
+    queries = [q for q, _ in pairs]
+    targets = [s for _, s in pairs]
+
+    grown = GasalAligner(match=2, mismatch=-3, gap_open=5, gap_extend=2,
+                         max_q=4096, max_t=16384, max_batch=3)
+    grown.resize(max_batch=len(pairs))  # whole corpus in one mini-batch
+    grown.resize(max_batch=1)           # shrink request: must be a no-op
+
+    batched = aligner.align_batch(queries, targets)
+    wide = grown.align_batch(queries, targets)
+    for i, (ra, rb) in enumerate(zip(batched, wide)):
+        ok, why = same_result(ra, rb)
+        assert ok, f"pair #{i}: {why}"
+
+def test_min_score_filter(aligner: GasalAligner):
+    pairs = build_pairs()
+    queries = [q for q, _ in pairs]
+    targets = [s for _, s in pairs]
+
+    full = aligner.align_batch(queries, targets)
+
+    # Threshold below any attainable score: every pair survives the filter
+    permissive = aligner.align_batch(queries, targets, min_score=-(10 ** 9))
+    for i, (ra, rb) in enumerate(zip(full, permissive)):
+        ok, why = same_result(ra, rb)
+        assert ok, f"pair #{i}: {why}"
+
+    # Threshold above any attainable score: no traceback anywhere
+    strict = aligner.align_batch(queries, targets, min_score=10 ** 9)
+    assert len(strict) == len(full)
+    for r in strict:
+        assert len(r.ops) == 0 and len(r.lens) == 0
+
+def test_multi_stream_matches_default(aligner: GasalAligner):
+    pairs = build_pairs()
+    queries = [q for q, _ in pairs]
+    targets = [s for _, s in pairs]
+
+    deep = GasalAligner(match=2, mismatch=-3, gap_open=5, gap_extend=2,
+                        max_q=4096, max_t=16384, max_batch=3, num_streams=4)
+    batched = aligner.align_batch(queries, targets)
+    overlapped = deep.align_batch(queries, targets)
+
+    mismatches = []
+    for i, (ra, rb) in enumerate(zip(batched, overlapped)):
+        ok, why = same_result(ra, rb)
+        if not ok:
+            mismatches.append(f"pair #{i}: {why}")
+    if mismatches:
+        pytest.fail("MISMATCHES detected:\n" + "\n".join(mismatches))
+
+def test_graphs_match_default(aligner: GasalAligner):
+    pairs = build_pairs()
+    queries = [q for q, _ in pairs]
+    targets = [s for _, s in pairs]
+
+    graphed = GasalAligner(match=2, mismatch=-3, gap_open=5, gap_extend=2,
+                           max_q=4096, max_t=16384, max_batch=3, use_graphs=True)
+    batched = aligner.align_batch(queries, targets)
+    # Run twice: the first pass captures the graphs, the second replays them,
+    # so wrong-shape replays (stale memcpy sizes) would show up here.
+    for _ in range(2):
+        replayed = graphed.align_batch(queries, targets)
+        mismatches = []
+        for i, (ra, rb) in enumerate(zip(batched, replayed)):
+            ok, why = same_result(ra, rb)
+            if not ok:
+                mismatches.append(f"pair #{i}: {why}")
+        if mismatches:
+            pytest.fail("MISMATCHES detected:\n" + "\n".join(mismatches))
+
+def test_arrays_match_objects(aligner: GasalAligner):
+    pairs = build_pairs()
+    queries = [q for q, _ in pairs]
+    targets = [s for _, s in pairs]
+
+    batched = aligner.align_batch(queries, targets)
+    recs, ops, lens = aligner.align_batch_arrays(queries, targets)
+
+    assert len(recs) == len(batched)
+    for i, r in enumerate(batched):
+        rec = recs[i]
+        assert (rec["score"], rec["q_beg"], rec["q_end"], rec["s_beg"], rec["s_end"]) == \
+               (r.score, r.q_beg, r.q_end, r.s_beg, r.s_end), f"record #{i} differs"
+        lo, hi = int(rec["ops_off"]), int(rec["ops_off"]) + int(rec["n_ops"])
+        assert np.array_equal(ops[lo:hi], r.ops), f"ops #{i} differ"
+        assert np.array_equal(lens[lo:hi], r.lens), f"lens #{i} differ"
+
+def test_soa_matches_objects(aligner: GasalAligner):
+    pairs = build_pairs()
+    queries = [q for q, _ in pairs]
+    targets = [s for _, s in pairs]
+
+    batched = aligner.align_batch(queries, targets)
+    soa = aligner.align_batch_soa(queries, targets)
+
+    assert len(soa) == len(batched)
+    assert np.array_equal(soa.scores, _result_matrix(batched)[:, 0])
+    assert np.array_equal(np.stack([soa.q_begs, soa.q_ends, soa.s_begs, soa.s_ends], axis=1),
+                          _result_matrix(batched)[:, 1:])
+    for i, r in enumerate(batched):
+        lo, hi = int(soa.ops_off[i]), int(soa.ops_off[i]) + int(soa.n_ops[i])
+        assert np.array_equal(soa.ops[lo:hi], r.ops), f"ops #{i} differ"
+        assert np.array_equal(soa.lens[lo:hi], r.lens), f"lens #{i} differ"
+        ok, why = same_result(soa[i], r)
+        assert ok, f"row #{i}: {why}"
+    with pytest.raises(IndexError):
+        soa[len(batched)]
+
+def test_packed_matches_ascii(aligner: GasalAligner):
+    from gasal2.sequtils import pack_batch
+
+    pairs = build_pairs()
+    queries = [q for q, _ in pairs]
+    targets = [s for _, s in pairs]
+
+    batched = aligner.align_batch(queries, targets)
+    q_packed, q_len = pack_batch(queries)
+    t_packed, t_len = pack_batch(targets)
+    packed = aligner.align_batch_packed(q_packed, q_len, t_packed, t_len)
+
+    assert len(packed) == len(batched), "length mismatch ascii vs packed"
+    mismatches = []
+    for i, (ra, rb) in enumerate(zip(batched, packed)):
+        ok, why = same_result(ra, rb)
+        if not ok:
+            qa, sa = pairs[i]
+            mismatches.append(f"pair #{i}: {why} (|q|={len(qa)}, |s|={len(sa)})")
+    if mismatches:
+        pytest.fail("MISMATCHES detected:\n" + "\n".join(mismatches))
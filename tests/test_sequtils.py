@@ -0,0 +1,56 @@
+# tests/test_sequtils.py
+import numpy as np
+import pytest
+
+sequtils = pytest.importorskip("gasal2.sequtils", reason="extension not built")
+
+
+def test_seq_to_codes_ascii_nibbles():
+    codes = sequtils.seq_to_codes("ACGTN")
+    assert codes.dtype == np.uint8
+    assert codes.tolist() == [0x1, 0x3, 0x7, 0x4, 0xE]
+
+
+def test_pack_seq_word_layout():
+    # One full word: 8 bases, most-significant nibble first
+    packed = sequtils.pack_seq("ACGTACGT")
+    assert packed.dtype == np.uint8
+    assert packed.size == 4
+    word = int(packed.view("<u4")[0])
+    assert word == 0x13741374
+
+
+def test_pack_seq_pads_to_whole_words():
+    for L, nbytes in [(1, 4), (8, 4), (9, 8), (16, 8), (17, 12)]:
+        assert sequtils.pack_seq("A" * L).size == nbytes
+
+
+def test_pack_batch_concatenates_blocks():
+    seqs = ["ACGT", "ACGTACGTA", ""]
+    packed, lens = sequtils.pack_batch(seqs)
+    assert lens.dtype == np.uint32
+    assert lens.tolist() == [4, 9, 0]
+    # 4 + 9 bases -> 1 + 2 words, empty sequence contributes nothing
+    assert packed.size == 4 + 8
+    assert np.array_equal(packed[:4], sequtils.pack_seq(seqs[0]))
+    assert np.array_equal(packed[4:], sequtils.pack_seq(seqs[1]))
+
+
+def test_pack_batch_empty():
+    packed, lens = sequtils.pack_batch([])
+    assert packed.size == 0 and lens.size == 0
+
+
+def test_valid_alphabet():
+    assert sequtils.valid_alphabet("ACGTNacgtn")
+    assert sequtils.valid_alphabet(b"ACGT")
+    assert sequtils.valid_alphabet("")
+    assert not sequtils.valid_alphabet("ACGU")
+    assert not sequtils.valid_alphabet("ACG-T")
+    assert not sequtils.valid_alphabet("ACGTé")
+
+
+def test_check_alphabet_reports_index():
+    sequtils.check_alphabet(["ACGT", "NNNN"])
+    with pytest.raises(ValueError, match="#1"):
+        sequtils.check_alphabet(["ACGT", "ACXT"])
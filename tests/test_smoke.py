@@ -121,17 +121,10 @@ def dump_alignment(res, q: str, s: str) -> None:
 
     
 @pytest.mark.skipif(not _has_gpu(), reason="No NVIDIA GPU available")
-def test_basic_align():
-    from gasal2 import GasalAligner
-    try:
-        aln = GasalAligner()
-    except TypeError:
-        # Fall back to a common scoring set if ctor requires it
-        aln = GasalAligner(match=2, mismatch=-3, gap_open=5, gap_extend=2,
-                            max_q=4096, max_t=16384, max_batch=3)
-
-    # Trivial identity alignment to exercise the kernel
+def test_basic_align(aligner):
+    # Trivial identity alignment to exercise the kernel; the aligner comes
+    # from the session-scoped fixture in conftest.py so GPU setup is paid once.
     q, s = "AAATCG", "AAATCG"
-    res = aln.align(q, s)  # API shape depends on your wrapper; just smoke it
+    res = aligner.align(q, s)  # API shape depends on your wrapper; just smoke it
     assert res is not None
     dump_alignment(res, q, s)